@@ -19,12 +19,18 @@ from pathlib import Path
 # Thêm src vào Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-try:
-    from src.ui.gradio_app import launch_app, create_interface
-    from src.pinyin_converter import get_converter
-    from src.api_handler import get_translation_handler
-except ImportError as e:
-    print(f"❌ Lỗi import module: {e}")
+# Các module của ứng dụng (gradio, pandas, ...) được import lazy trong main()
+# để `python main.py --help` không phải trả chi phí import nặng.
+
+
+def import_error_exit(error: ImportError) -> None:
+    """
+    In hướng dẫn khi thiếu dependencies và thoát.
+
+    Args:
+        error (ImportError): Lỗi import gặp phải
+    """
+    print(f"❌ Lỗi import module: {error}")
     print("🔧 Hãy đảm bảo đã cài đặt dependencies: pip install -r requirements.txt")
     sys.exit(1)
 
@@ -68,7 +74,9 @@ def check_dependencies() -> bool:
         'gradio',
         'pypinyin', 
         'requests',
-        'pandas'
+        'pandas',
+        'httpx',
+        'h2'  # httpx[http2], cần cho AsyncHTTPTransport(http2=True)
     ]
     
     missing_packages = []
@@ -97,6 +105,9 @@ def test_core_functions() -> bool:
     logger = logging.getLogger(__name__)
     
     try:
+        from src.pinyin_converter import get_converter
+        from src.api_handler import get_translation_handler
+
         # Test Pinyin converter
         logger.info("🧪 Testing Pinyin converter...")
         pinyin_converter = get_converter()
@@ -200,28 +211,35 @@ Ví dụ sử dụng:
     # In thông tin khởi động
     print_startup_info()
     
-    # Kiểm tra dependencies
-    logger.info("🔍 Kiểm tra dependencies...")
-    if not check_dependencies():
-        print("\n❌ Vui lòng cài đặt đầy đủ dependencies trước khi chạy:")
-        print("   pip install -r requirements.txt")
-        sys.exit(1)
-    
-    logger.info("✅ Dependencies OK")
-    
-    # Test core functions
-    logger.info("🧪 Kiểm tra chức năng core...")
-    if not test_core_functions():
-        print("\n❌ Core function tests failed. Vui lòng kiểm tra cấu hình.")
-        sys.exit(1)
-    
-    logger.info("✅ Core functions OK")
+    # Kiểm tra dependencies và chức năng core chỉ ở chế độ debug/test,
+    # lần chạy thường sẽ báo lỗi thiếu dependencies khi import
+    if args.debug or args.test_only:
+        logger.info("🔍 Kiểm tra dependencies...")
+        if not check_dependencies():
+            print("\n❌ Vui lòng cài đặt đầy đủ dependencies trước khi chạy:")
+            print("   pip install -r requirements.txt")
+            sys.exit(1)
+        
+        logger.info("✅ Dependencies OK")
+        
+        # Test core functions
+        logger.info("🧪 Kiểm tra chức năng core...")
+        if not test_core_functions():
+            print("\n❌ Core function tests failed. Vui lòng kiểm tra cấu hình.")
+            sys.exit(1)
+        
+        logger.info("✅ Core functions OK")
     
     # Nếu chỉ test thôi thì dừng ở đây
     if args.test_only:
         print("\n✅ Tất cả tests đều passed. Ứng dụng sẵn sàng chạy.")
         return
     
+    try:
+        from src.ui.gradio_app import launch_app
+    except ImportError as e:
+        import_error_exit(e)
+    
     # Khởi chạy ứng dụng
     try:
         print(f"\n🚀 Đang khởi động ứng dụng...")
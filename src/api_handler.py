@@ -7,82 +7,251 @@ từ tiếng Trung sang tiếng Việt với retry logic và error handling.
 
 Features:
 - Gọi LibreTranslate API với fallback servers
-- Retry logic với exponential backoff
+- Retry với exponential backoff khi gặp 429/5xx (tôn trọng Retry-After)
 - Cache kết quả để tối ưu performance
-- Rate limiting để tránh spam API
+- Rate limiting theo từng endpoint (token bucket) để tránh spam API
+- Dịch batch đồng thời với httpx.AsyncClient (connection pooling, HTTP/2)
+- Gộp nhiều từ vào một request khi dịch batch
+- Hedged request: gửi song song tới endpoint dự phòng khi endpoint chính chậm/lỗi
+- Từ điển offline (TSV) tra trước khi gọi API, cụm từ dài được tách
+  theo từ điển và chỉ dịch phần còn thiếu
 """
 
+import asyncio
+import atexit
+import contextlib
 import logging
+import queue
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 import json
-from typing import Dict, List, Optional, Tuple, Any
+import mmap
+from collections import OrderedDict
+from functools import cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import httpx
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import hashlib
 import os
-from urllib.parse import quote
+from urllib.parse import quote_from_bytes
+
+try:
+    import orjson
+except ImportError:  # orjson là tùy chọn, fallback về json chuẩn
+    orjson = None
+
+# Regex chữ Hán dùng chung với pinyin_converter: văn bản không chứa chữ Hán
+# (số, dấu câu, tiếng Việt...) được trả về nguyên văn, không gọi API
+try:
+    from .han import HAN_RE
+except ImportError:  # Import trực tiếp qua sys.path (không qua package src)
+    from han import HAN_RE
 
 # Cấu hình logging
 logger = logging.getLogger(__name__)
 
 
+def _json_loads(data: Any) -> Any:
+    """Parse JSON từ bytes/memoryview (dùng orjson nếu có)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data))
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize object sang JSON bytes gọn (không indent)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _is_new_translation(translation: str, source: str) -> bool:
+    """
+    Kiểm tra bản dịch hợp lệ: không rỗng và khác văn bản gốc.
+
+    So sánh không phân biệt hoa thường; trường hợp API trả nguyên văn
+    được loại ngay bằng phép so sánh trực tiếp, không cần lower().
+
+    Args:
+        translation (str): Bản dịch đã strip
+        source (str): Văn bản gốc
+
+    Returns:
+        bool: True nếu bản dịch dùng được
+    """
+    if not translation or translation == source:
+        return False
+    return translation.lower() != source.lower()
+
+
+# Ký tự phân cách khi gộp nhiều văn bản vào một request dịch
+_JOIN_SEPARATOR = "\n===\n"
+# API có thể đổi khoảng trắng quanh dấu phân cách, nên tách theo regex
+_JOIN_SPLIT_RE = re.compile(r"\s*={3}\s*")
+# Các loại endpoint nhận văn bản dài qua query/body (không qua URL path)
+_JOINABLE_ENDPOINT_TYPES = ("mymemory", "libretranslate")
+# Key MD5 hex của định dạng cache cũ
+_LEGACY_KEY_RE = re.compile(r"[0-9a-f]{32}")
+# Sentinel yêu cầu writer thread flush file cache ngay
+_FLUSH = object()
+
+# API endpoints miễn phí cho dịch thuật, mỗi endpoint là (url, type, description)
+Endpoint = Tuple[str, str, str]
+API_ENDPOINTS: Tuple[Endpoint, ...] = (
+    # MyMemory API - miễn phí, không cần key
+    ("https://api.mymemory.translated.net/get", "mymemory", "MyMemory Free API"),
+    # LibreTranslate instances đang hoạt động
+    ("https://libretranslate.de/translate", "libretranslate", "LibreTranslate Germany"),
+    ("https://translate.argosopentech.com/translate", "libretranslate", "Argos Open Tech"),
+    # Lingva Translate (Google Translate proxy)
+    ("https://lingva.ml/api/v1", "lingva", "Lingva Translate"),
+)
+
+# Retry khi gặp các status tạm thời, dùng chung cho requests session và AsyncClient
+_MAX_RETRIES = 3
+_BACKOFF_FACTOR = 1
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_RETRY = Retry(
+    total=_MAX_RETRIES,
+    backoff_factor=_BACKOFF_FACTOR,
+    status_forcelist=_RETRY_STATUSES,
+    allowed_methods=frozenset({"GET", "POST"})
+)
+# Session chỉ còn dùng cho request đồng bộ lẻ (get_supported_languages) nên giữ pool mặc định
+_ADAPTER = HTTPAdapter(max_retries=_RETRY)
+
+
+class TokenBucket:
+    """
+    Token bucket giới hạn tốc độ gọi một endpoint.
+
+    Token được nạp lại liên tục theo rate (token/giây), tối đa burst token.
+    Chỉ dùng trên event loop nền nên không cần lock.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Args:
+            rate (float): Số request trung bình mỗi giây
+            burst (int): Số request tối đa gửi liền nhau
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        """
+        Chờ tới khi có token rồi lấy token đó.
+
+        Token chỉ bị trừ khi đã sẵn sàng (không có await giữa bước kiểm tra
+        và bước trừ), nên task bị hủy trong lúc chờ không làm mất token và
+        bucket không bao giờ bị âm.
+        """
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
 class TranslationAPIHandler:
     """
     Handler cho việc dịch nghĩa sử dụng LibreTranslate API.
     """
 
-    def __init__(self, cache_dir: str = "data"):
+    # Session dùng chung giữa các instance để tái sử dụng kết nối keep-alive
+    _shared_session: Optional[requests.Session] = None
+
+    def __init__(self, cache_dir: str = "data", local_dict_file: Optional[str] = None):
         """
         Khởi tạo API handler.
 
         Args:
             cache_dir (str): Thư mục lưu cache (mặc định "data")
+            local_dict_file (Optional[str]): File từ điển offline Trung - Việt
+                (mặc định "<cache_dir>/local_dict.tsv", bỏ qua nếu không tồn tại)
         """
         # API endpoints miễn phí cho dịch thuật
-        self.api_endpoints = [
-            # MyMemory API - miễn phí, không cần key
-            {
-                "url": "https://api.mymemory.translated.net/get",
-                "type": "mymemory",
-                "description": "MyMemory Free API"
-            },
-            # LibreTranslate instances đang hoạt động
-            {
-                "url": "https://libretranslate.de/translate", 
-                "type": "libretranslate",
-                "description": "LibreTranslate Germany"
-            },
-            {
-                "url": "https://translate.argosopentech.com/translate",
-                "type": "libretranslate", 
-                "description": "Argos Open Tech"
-            },
-            # Lingva Translate (Google Translate proxy)
-            {
-                "url": "https://lingva.ml/api/v1",
-                "type": "lingva",
-                "description": "Lingva Translate"
-            }
-        ]
+        self.api_endpoints = API_ENDPOINTS
         
         # Cấu hình API
         self.source_lang = "zh"  # Chinese
         self.target_lang = "vi"  # Vietnamese
         self.timeout = 10  # seconds
-        self.max_retries = 3
+        self.max_retries = _MAX_RETRIES
+        self.max_concurrency = 8  # Số request đồng thời tối đa khi dịch batch
+        self.max_joined_bytes = 500  # Giới hạn q của MyMemory (byte UTF-8) khi gộp batch
+        # seconds, chờ trước khi gửi thêm tới endpoint dự phòng. Đặt theo độ trễ
+        # thực tế của các API công cộng (p95 cỡ 1s): endpoint chính khỏe chỉ
+        # tốn một request, không nhân quota/token bucket cho mọi lần tra cứu
+        self.hedge_delay = 1.0
+        # seconds, độ trễ dự kiến của một request dịch gộp. Hạn chót cho dịch gộp
+        # là hedge_delay × số endpoint gộp + joined_rtt, để mọi endpoint dự phòng
+        # đều kịp được thử trước khi chuyển sang dịch từng văn bản
+        self.joined_rtt = 1.0
+        # Phần đầu URL của Lingva (/api/v1/{source}/{target}/) tính sẵn cho mỗi endpoint
+        self._lingva_prefixes: Dict[str, str] = {
+            endpoint_url: f"{endpoint_url}/{self.source_lang}/{self.target_lang}/"
+            for endpoint_url, endpoint_type, _ in self.api_endpoints
+            if endpoint_type == "lingva"
+        }
         
         # Cache configuration
         self.cache_dir = cache_dir
-        self.cache_file = os.path.join(cache_dir, "translation_cache.json")
+        # Cache lưu dạng JSONL append-only: mỗi dòng một entry {"k": ..., "v": ...}
+        self.cache_file = os.path.join(cache_dir, "translation_cache.jsonl")
+        self.legacy_cache_file = os.path.join(cache_dir, "translation_cache.json")
+        self._cache_fh = None  # File handle append mode (mở lazy)
+        self._cache_lines = 0  # Số dòng hiện có trong file cache
+        self._legacy_cache: Dict[str, str] = {}  # Entries key MD5 cũ, chuyển đổi khi được tra cứu
+        # Handler là singleton dùng chung giữa các thread của Gradio:
+        # mọi thao tác sửa cache/file cache đều đi qua lock này
+        self._cache_lock = threading.RLock()
+        self.max_cache_entries = 100_000  # Giới hạn LRU, entry ít dùng nhất bị loại trước
+        # Ghi file cache qua writer thread nền, không chặn thread đang dịch
+        self._file_lock = threading.RLock()  # Bảo vệ _cache_fh và _cache_lines
+        self._write_q: "queue.Queue" = queue.Queue()
+        self.flush_every = 64  # Flush file sau số entries này...
+        self.flush_interval = 1.0  # ...hoặc sau số giây này (tùy điều kiện nào đến trước)
         self.cache = self._load_cache()
+        self.compact_cache()
+        self._writer = threading.Thread(
+            target=self._writer_loop,
+            name="translation-cache-writer",
+            daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.flush_cache)
+
+        # Từ điển offline: tra trước khi gọi API
+        self.local_dict_file = local_dict_file or os.path.join(cache_dir, "local_dict.tsv")
+        self.local_dict = self._load_local_dict()
+        self._local_dict_max_len = max(map(len, self.local_dict), default=0)
         
-        # Rate limiting (để tránh spam)
-        self.last_request_time = 0
-        self.min_request_interval = 0.5  # seconds
+        # Rate limiting riêng cho từng endpoint (để tránh spam)
+        self._buckets: Dict[str, TokenBucket] = {
+            endpoint_url: TokenBucket(rate=2.0, burst=4)
+            for endpoint_url, _, _ in self.api_endpoints
+        }
         
-        # Tạo session với retry strategy
-        self.session = self._create_session()
+        # Session với retry strategy (dùng chung giữa các instance)
+        if TranslationAPIHandler._shared_session is None:
+            TranslationAPIHandler._shared_session = self._create_session()
+        self.session = TranslationAPIHandler._shared_session
+
+        # Event loop chạy nền + AsyncClient dùng lâu dài cho các request async
+        # (tạo lazy khi cần lần đầu)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        self._async_client: Optional[httpx.AsyncClient] = None
 
     def _create_session(self) -> requests.Session:
         """
@@ -92,153 +261,459 @@ class TranslationAPIHandler:
             requests.Session: Session đã cấu hình
         """
         session = requests.Session()
+        session.mount("http://", _ADAPTER)
+        session.mount("https://", _ADAPTER)
         
-        # Cấu hình retry strategy
-        retry_strategy = Retry(
-            total=self.max_retries,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["GET", "POST"]
-        )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
-        
-        # Headers
+        # Headers (Content-Type chỉ được đặt cho POST qua tham số json=)
         session.headers.update({
-            'Content-Type': 'application/json',
             'User-Agent': 'HanViet-Lookup-App/1.0'
         })
         
         return session
 
+    def _create_async_client(self) -> httpx.AsyncClient:
+        """
+        Tạo httpx.AsyncClient dùng chung cho các request async.
+
+        Returns:
+            httpx.AsyncClient: Client với connection pool và HTTP/2
+        """
+        limits = httpx.Limits(max_connections=16, max_keepalive_connections=16)
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            limits=limits,
+            retries=self.max_retries
+        )
+
+        return httpx.AsyncClient(
+            transport=transport,
+            timeout=self.timeout,
+            headers={'User-Agent': 'HanViet-Lookup-App/1.0'}
+        )
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Lấy event loop chạy nền (khởi tạo thread nếu chưa có).
+
+        AsyncClient gắn với một event loop cố định, nên tất cả coroutine
+        đều được chạy trên cùng loop này để tái sử dụng kết nối.
+
+        Returns:
+            asyncio.AbstractEventLoop: Event loop chạy nền
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                # Công việc blocking trên loop (ví dụ DNS lookup) dùng pool có giới hạn
+                loop.set_default_executor(ThreadPoolExecutor(
+                    max_workers=self.max_concurrency,
+                    thread_name_prefix="translation-worker"
+                ))
+                thread = threading.Thread(
+                    target=loop.run_forever,
+                    name="translation-event-loop",
+                    daemon=True
+                )
+                thread.start()
+                self._loop = loop
+        return self._loop
+
+    def _run_async(self, coro) -> Any:
+        """
+        Chạy coroutine trên event loop nền và chờ kết quả.
+
+        Args:
+            coro: Coroutine cần chạy
+
+        Returns:
+            Any: Kết quả của coroutine
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+        return future.result()
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Lấy AsyncClient dùng chung (chỉ gọi trong event loop nền)."""
+        if self._async_client is None:
+            self._async_client = self._create_async_client()
+        return self._async_client
+
+    def warm_up(self) -> None:
+        """Khởi động trước event loop nền và AsyncClient (không gửi request nào)."""
+        async def create_client() -> None:
+            self._get_async_client()
+
+        self._run_async(create_client())
+
     def _load_cache(self) -> Dict[str, str]:
         """
         Load translation cache từ file.
 
+        Đọc file JSONL (entry sau ghi đè entry trước). Nếu chỉ có file cache
+        JSON cũ thì chuyển đổi sang JSONL. Các entry dùng key MD5 cũ được tách
+        riêng vào _legacy_cache. Thứ tự dòng trong file là thứ tự LRU.
+
         Returns:
-            Dict[str, str]: Cache dictionary
+            OrderedDict[str, str]: Cache theo thứ tự LRU (cũ nhất trước)
         """
+        cache: "OrderedDict[str, str]" = OrderedDict()
+
         try:
             if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    cache = json.load(f)
+                loads = _json_loads
+                line_count = 0
+                with open(self.cache_file, 'rb') as f:
+                    for line in f:
+                        try:
+                            entry = loads(line)
+                            key, value = entry["k"], entry["v"]
+                            if not isinstance(key, str) or not isinstance(value, (str, type(None))):
+                                raise TypeError("sai kiểu k/v")
+                        except (ValueError, KeyError, TypeError):
+                            # Dòng trống, ghi dở (ví dụ tiến trình bị dừng đột ngột)
+                            # hoặc không phải object {"k", "v"}: chỉ bỏ qua dòng này
+                            if line.strip():
+                                logger.warning("Bỏ qua dòng cache không hợp lệ")
+                            continue
+                        line_count += 1
+                        if value is None:
+                            # Tombstone: entry đã bị xóa/chuyển key
+                            cache.pop(key, None)
+                        else:
+                            cache[key] = value
+                            cache.move_to_end(key)
+                self._cache_lines += line_count
                 logger.info(f"Loaded {len(cache)} cached translations")
-                return cache
+
+            elif os.path.exists(self.legacy_cache_file):
+                # File JSON cũ có thể rất lớn: parse trực tiếp từ mmap, không copy
+                with open(self.legacy_cache_file, 'rb') as f:
+                    if os.fstat(f.fileno()).st_size > 0:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                            view = memoryview(buf)
+                            try:
+                                cache = OrderedDict(_json_loads(view))
+                            finally:
+                                view.release()
+                self._write_cache_file(cache)
+                os.remove(self.legacy_cache_file)
+                logger.info(f"Đã chuyển {len(cache)} cached translations sang định dạng JSONL")
+
         except Exception as e:
             logger.warning(f"Không thể load cache: {e}")
+
+        for key in [key for key in cache if _LEGACY_KEY_RE.fullmatch(key)]:
+            self._legacy_cache[key] = cache.pop(key)
+
+        while len(cache) > self.max_cache_entries:
+            cache.popitem(last=False)
         
-        return {}
+        return cache
+
+    def _load_local_dict(self) -> Dict[str, str]:
+        """
+        Load từ điển offline từ file TSV.
+
+        Mỗi dòng có dạng "<chữ Hán>\t<nghĩa tiếng Việt>"; dòng trống và dòng
+        bắt đầu bằng "#" được bỏ qua.
+
+        Returns:
+            Dict[str, str]: Từ điển {chữ Hán: nghĩa}
+        """
+        local_dict: Dict[str, str] = {}
+
+        if not os.path.exists(self.local_dict_file):
+            logger.debug(f"Không có từ điển offline: {self.local_dict_file}")
+            return local_dict
 
-    def _save_cache(self) -> None:
-        """Save cache to file."""
         try:
-            os.makedirs(self.cache_dir, exist_ok=True)
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, ensure_ascii=False, indent=2)
-            logger.debug("Cache saved successfully")
+            with open(self.local_dict_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip() or line.startswith('#'):
+                        continue
+                    word, sep, meaning = line.rstrip('\r\n').partition('\t')
+                    word, meaning = word.strip(), meaning.strip()
+                    if sep and word and meaning:
+                        local_dict[word] = meaning
+            logger.info(f"Loaded {len(local_dict)} từ trong từ điển offline")
         except Exception as e:
-            logger.error(f"Không thể save cache: {e}")
+            logger.warning(f"Không thể load từ điển offline: {e}")
+
+        return local_dict
+
+    def _open_cache_file(self):
+        """Mở (lazy) file cache ở chế độ append."""
+        if self._cache_fh is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._cache_fh = open(self.cache_file, 'ab')
+        return self._cache_fh
+
+    def _close_cache_file(self) -> None:
+        """Đóng file handle của cache (nếu đang mở)."""
+        with self._file_lock:
+            if self._cache_fh is not None:
+                self._cache_fh.close()
+                self._cache_fh = None
+
+    def _save_entry(self, key: str, value: Optional[str]) -> None:
+        """
+        Đưa một entry vào hàng đợi để writer thread ghi vào cuối file cache.
+
+        Args:
+            key (str): Cache key
+            value (Optional[str]): Bản dịch (None để đánh dấu xóa entry)
+        """
+        self._write_q.put((key, value))
+
+    def _writer_loop(self) -> None:
+        """
+        Vòng lặp của writer thread: ghi các entry trong hàng đợi vào file cache.
+
+        File được flush sau mỗi flush_every entries, sau flush_interval giây
+        kể từ entry chưa flush đầu tiên, hoặc khi nhận _FLUSH.
+        """
+        unflushed = 0
+        first_unflushed = 0.0
+
+        while True:
+            timeout = None
+            if unflushed:
+                timeout = max(0.0, self.flush_interval - (time.monotonic() - first_unflushed))
+            try:
+                item = self._write_q.get(timeout=timeout)
+            except queue.Empty:
+                item = None  # Hết thời gian chờ: flush các entry còn lại
+
+            try:
+                with self._file_lock:
+                    if isinstance(item, tuple):
+                        key, value = item
+                        self._open_cache_file().write(_json_dumps({"k": key, "v": value}) + b"\n")
+                        self._cache_lines += 1
+                        if not unflushed:
+                            first_unflushed = time.monotonic()
+                        unflushed += 1
+
+                    if self._cache_fh is None:
+                        # File đã được đóng (nén/xóa cache) nên không còn gì để flush
+                        unflushed = 0
+                    elif unflushed and (
+                        not isinstance(item, tuple)
+                        or unflushed >= self.flush_every
+                        or time.monotonic() - first_unflushed >= self.flush_interval
+                    ):
+                        self._cache_fh.flush()
+                        unflushed = 0
+            except Exception as e:
+                logger.error(f"Không thể save cache: {e}")
+                unflushed = 0
+            finally:
+                if item is not None:
+                    self._write_q.task_done()
+
+    def flush_cache(self) -> None:
+        """Chờ writer thread ghi hết các entry đang chờ và flush file cache."""
+        self._write_q.put(_FLUSH)
+        self._write_q.join()
+
+    def _write_cache_file(self, cache: Dict[str, str]) -> None:
+        """
+        Ghi lại toàn bộ cache ra file JSONL mới (thay thế file cũ).
+
+        Args:
+            cache (Dict[str, str]): Cache cần ghi
+        """
+        with self._file_lock:
+            self._close_cache_file()
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+            tmp_file = self.cache_file + ".tmp"
+            with open(tmp_file, 'wb') as f:
+                for key, value in cache.items():
+                    f.write(_json_dumps({"k": key, "v": value}) + b"\n")
+            os.replace(tmp_file, self.cache_file)
+
+            self._cache_lines = len(cache)
+
+    def compact_cache(self) -> bool:
+        """
+        Nén file cache khi số dòng vượt quá 2 lần số entries.
+
+        Returns:
+            bool: True nếu file cache đã được ghi lại
+        """
+        with self._cache_lock:
+            limit = 2 * (len(self.cache) + len(self._legacy_cache))
+            # Ước lượng trước (dòng đã ghi + dòng trong hàng đợi) để không phải
+            # chờ writer thread ở mỗi lần gọi khi chưa cần nén
+            if self._cache_lines + self._write_q.qsize() <= limit:
+                return False
+
+            # Đợi writer thread ghi xong: số dòng chính xác và không mất entry khi thay file
+            self._write_q.join()
+            if self._cache_lines <= limit:
+                return False
+
+            try:
+                lines_before = self._cache_lines
+                self._write_cache_file({**self._legacy_cache, **self.cache})
+                logger.info(f"Đã nén cache: {lines_before} -> {self._cache_lines} dòng")
+                return True
+            except Exception as e:
+                logger.error(f"Không thể nén cache: {e}")
+                return False
 
     def _get_cache_key(self, text: str) -> str:
         """
         Tạo cache key từ text.
 
+        Dùng chính text làm key (dict và JSONL đều hỗ trợ unicode),
+        không cần hash.
+
         Args:
-            text (str): Text cần hash
+            text (str): Text đã strip
 
         Returns:
-            str: Hash key
+            str: Cache key
         """
-        return hashlib.md5(text.encode('utf-8')).hexdigest()
+        return text
 
-    def _rate_limit(self) -> None:
-        """Apply rate limiting."""
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-        
-        if elapsed < self.min_request_interval:
-            sleep_time = self.min_request_interval - elapsed
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+    def _cache_get(self, key: str) -> Optional[str]:
+        """
+        Lấy entry từ cache và đánh dấu vừa được dùng (LRU).
 
-    def _try_endpoint(self, text: str, endpoint_config: Dict[str, str]) -> Tuple[bool, str]:
+        Args:
+            key (str): Cache key
+
+        Returns:
+            Optional[str]: Bản dịch hoặc None
         """
-        Thử dịch với một endpoint cụ thể.
-        
+        with self._cache_lock:
+            value = self.cache.get(key)
+            if value is not None:
+                self.cache.move_to_end(key)
+            return value
+
+    def _cache_put(self, key: str, value: str) -> None:
+        """
+        Thêm entry vào cache (loại entry cũ nhất khi vượt giới hạn) và ghi ra file.
+
+        Entry bị loại vẫn còn trong file cho tới lần nén cache tiếp theo.
+
         Args:
-            text (str): Text cần dịch
-            endpoint_config (Dict[str, str]): Cấu hình endpoint
-            
+            key (str): Cache key
+            value (str): Bản dịch
+        """
+        with self._cache_lock:
+            self.cache[key] = value
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.max_cache_entries:
+                self.cache.popitem(last=False)
+            self._save_entry(key, value)
+
+    def _cache_lookup(self, text: str) -> Optional[str]:
+        """
+        Tra cứu bản dịch trong cache.
+
+        Nếu không có, thử key MD5 của cache cũ và chuyển entry sang key mới.
+
+        Args:
+            text (str): Text đã strip
+
         Returns:
-            Tuple[bool, str]: (success, translation_or_error)
+            Optional[str]: Bản dịch hoặc None nếu chưa có
         """
-        endpoint_type = endpoint_config["type"]
-        endpoint_url = endpoint_config["url"]
-        
-        try:
-            if endpoint_type == "mymemory":
-                return self._try_mymemory(text, endpoint_url)
-            elif endpoint_type == "libretranslate":
-                return self._try_libretranslate(text, endpoint_url)
-            elif endpoint_type == "lingva":
-                return self._try_lingva(text, endpoint_url)
-            else:
-                return False, f"Unknown endpoint type: {endpoint_type}"
-                
-        except Exception as e:
-            return False, f"Error: {e}"
+        cache_key = self._get_cache_key(text)
+        translation = self._cache_get(cache_key)
+
+        if translation is None and self._legacy_cache:
+            legacy_key = hashlib.md5(text.encode('utf-8')).hexdigest()
+            with self._cache_lock:
+                translation = self._legacy_cache.pop(legacy_key, None)
+                if translation is not None:
+                    self._cache_put(cache_key, translation)
+                    self._save_entry(legacy_key, None)
+
+        return translation
+
+    def _lookup_offline(self, text: str) -> Optional[Tuple[str, str]]:
+        """
+        Tra cứu không cần mạng: văn bản không có chữ Hán được giữ nguyên,
+        sau đó tra cache rồi đến từ điển offline.
+
+        Args:
+            text (str): Text đã strip
+
+        Returns:
+            Optional[Tuple[str, str]]: (translation, source) hoặc None
+        """
+        if HAN_RE.search(text) is None:
+            return text, "passthrough"
+
+        cached = self._cache_lookup(text)
+        if cached is not None:
+            return cached, "cache"
+
+        local = self.local_dict.get(text)
+        if local is not None:
+            return local, "local"
 
-    def _try_mymemory(self, text: str, endpoint_url: str) -> Tuple[bool, str]:
-        """Thử MyMemory API."""
-        params = {
+        return None
+
+    async def _arate_limit(self, endpoint_url: str) -> None:
+        """Chờ nếu endpoint đã vượt quá giới hạn tốc độ."""
+        await self._buckets[endpoint_url].acquire()
+
+    def _mymemory_params(self, text: str) -> Dict[str, str]:
+        """Tạo query params cho MyMemory API."""
+        return {
             "q": text,
             "langpair": f"{self.source_lang}|{self.target_lang}"
         }
-        
-        response = self.session.get(endpoint_url, params=params, timeout=self.timeout)
-        
+
+    def _libretranslate_payload(self, text: str) -> Dict[str, str]:
+        """Tạo JSON payload cho LibreTranslate API."""
+        return {
+            "q": text,
+            "source": self.source_lang,
+            "target": self.target_lang,
+            "format": "text"
+        }
+
+    def _lingva_url(self, text: str, endpoint_url: str) -> str:
+        """Tạo URL cho Lingva Translate API."""
+        # Lingva format: /api/v1/{source}/{target}/{text}; "/" trong text cũng được encode
+        return self._lingva_prefixes[endpoint_url] + quote_from_bytes(text.encode('utf-8'), safe=b'')
+
+    def _parse_mymemory(self, text: str, response: Any) -> Tuple[bool, str]:
+        """Đọc kết quả từ response của MyMemory API."""
         if response.status_code == 200:
-            data = response.json()
+            data = _json_loads(response.content)
             if data.get("responseStatus") == 200:
                 translation = data.get("responseData", {}).get("translatedText", "").strip()
-                if translation and translation.lower() != text.lower():
+                if _is_new_translation(translation, text):
                     return True, translation
                 
         return False, f"MyMemory failed: {response.status_code}"
 
-    def _try_libretranslate(self, text: str, endpoint_url: str) -> Tuple[bool, str]:
-        """Thử LibreTranslate API."""
-        data = {
-            "q": text,
-            "source": self.source_lang,
-            "target": self.target_lang,
-            "format": "text"
-        }
-        
-        response = self.session.post(endpoint_url, json=data, timeout=self.timeout)
-        
+    def _parse_libretranslate(self, text: str, response: Any) -> Tuple[bool, str]:
+        """Đọc kết quả từ response của LibreTranslate API."""
         if response.status_code == 200:
-            result = response.json()
+            result = _json_loads(response.content)
             if "translatedText" in result:
                 translation = result["translatedText"].strip()
                 if translation:
                     return True, translation
         
-        return False, f"LibreTranslate failed: {response.status_code} - {response.text[:100]}"
+        if logger.isEnabledFor(logging.DEBUG):
+            # Chỉ decode 100 byte đầu của body thay vì toàn bộ response.text
+            snippet = response.content[:100].decode('utf-8', errors='replace')
+            logger.debug(f"LibreTranslate response lỗi: {snippet}")
+        return False, f"LibreTranslate failed: {response.status_code}"
 
-    def _try_lingva(self, text: str, endpoint_url: str) -> Tuple[bool, str]:
-        """Thử Lingva Translate API."""
-        # Lingva format: /api/v1/{source}/{target}/{text}
-        encoded_text = quote(text)
-        url = f"{endpoint_url}/{self.source_lang}/{self.target_lang}/{encoded_text}"
-        
-        response = self.session.get(url, timeout=self.timeout)
-        
+    def _parse_lingva(self, text: str, response: Any) -> Tuple[bool, str]:
+        """Đọc kết quả từ response của Lingva Translate API."""
         if response.status_code == 200:
-            data = response.json()
+            data = _json_loads(response.content)
             if "translation" in data:
                 translation = data["translation"].strip()
                 if translation:
@@ -246,26 +721,459 @@ class TranslationAPIHandler:
         
         return False, f"Lingva failed: {response.status_code}"
 
-    def _try_googletrans_fallback(self, text: str) -> Tuple[bool, str]:
+    async def _atry_endpoint(
+        self,
+        text: str,
+        endpoint: Endpoint,
+        client: httpx.AsyncClient,
+        on_send: Optional[Callable[[], None]] = None
+    ) -> Tuple[bool, str]:
         """
-        Fallback cuối cùng sử dụng googletrans library.
-        
+        Thử dịch với một endpoint cụ thể qua AsyncClient dùng chung.
+
+        Gặp 429/5xx thì gửi lại tối đa max_retries lần với exponential backoff
+        (mỗi lần gửi lại cũng lấy token của rate limit).
+
         Args:
             text (str): Text cần dịch
-            
+            endpoint (Endpoint): (url, type, description) của endpoint
+            client (httpx.AsyncClient): Client async
+            on_send (Optional[Callable[[], None]]): Gọi khi đã qua rate limit,
+                ngay trước khi gửi request
+
+        Returns:
+            Tuple[bool, str]: (success, translation_or_error)
+        """
+        endpoint_url, endpoint_type, _ = endpoint
+
+        if endpoint_type == "mymemory":
+            send = lambda: client.get(endpoint_url, params=self._mymemory_params(text))
+            parse = self._parse_mymemory
+        elif endpoint_type == "libretranslate":
+            send = lambda: client.post(endpoint_url, json=self._libretranslate_payload(text))
+            parse = self._parse_libretranslate
+        elif endpoint_type == "lingva":
+            send = lambda: client.get(self._lingva_url(text, endpoint_url))
+            parse = self._parse_lingva
+        else:
+            return False, f"Unknown endpoint type: {endpoint_type}"
+
+        try:
+            for attempt in range(self.max_retries + 1):
+                await self._arate_limit(endpoint_url)
+                if attempt == 0 and on_send is not None:
+                    on_send()
+                response = await send()
+                if response.status_code not in _RETRY_STATUSES or attempt == self.max_retries:
+                    break
+                delay = self._retry_delay(response, attempt)
+                logger.debug(f"{endpoint_url} trả về {response.status_code}, thử lại sau {delay:.1f}s")
+                await asyncio.sleep(delay)
+            return parse(text, response)
+
+        except Exception as e:
+            return False, f"Error: {e}"
+
+    def _retry_delay(self, response: Any, attempt: int) -> float:
+        """
+        Tính thời gian chờ trước khi gửi lại request bị 429/5xx.
+
+        Args:
+            response (Any): Response lỗi
+            attempt (int): Số lần đã thử lại (bắt đầu từ 0)
+
+        Returns:
+            float: Số giây cần chờ, theo Retry-After nếu server gửi (tối đa self.timeout)
+        """
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), self.timeout)
+        return _BACKOFF_FACTOR * (2 ** attempt)
+
+    async def _arace(
+        self,
+        text: str,
+        client: httpx.AsyncClient,
+        endpoints: Optional[Sequence[Endpoint]] = None,
+        validate: Optional[Callable[[str], Optional[str]]] = None
+    ) -> Tuple[bool, str, str]:
+        """
+        Gửi request tới các endpoint theo kiểu hedged request.
+
+        Endpoint tiếp theo được khởi động khi endpoint trước thất bại hoặc
+        chưa trả lời sau hedge_delay giây kể từ lúc gửi request (thời gian chờ
+        token của rate limit không tính); lấy kết quả thành công đầu tiên
+        và hủy các request còn lại. Độ trễ xấu nhất là max(timeouts) thay vì
+        sum(timeouts).
+
+        Args:
+            text (str): Văn bản đã strip
+            client (httpx.AsyncClient): Client async dùng chung
+            endpoints (Optional[Sequence[Endpoint]]): Các endpoint theo thứ tự ưu tiên
+                (mặc định self.api_endpoints)
+            validate (Optional[Callable[[str], Optional[str]]]): Kiểm tra thêm bản dịch,
+                trả về thông báo lỗi nếu không dùng được (coi như endpoint thất bại)
+
+        Returns:
+            Tuple[bool, str, str]: (success, translation/error_message, used_endpoint)
+        """
+        loop = asyncio.get_running_loop()
+        # Thời điểm khởi động endpoint dự phòng; None khi endpoint mới nhất còn
+        # chờ token của chính nó (thời gian chờ bucket không tính vào hedge_delay)
+        hedge_at: Optional[float] = None
+        sent = asyncio.Event()
+        started = 0
+
+        async def attempt(endpoint: Endpoint, index: int) -> Tuple[str, bool, str]:
+            def on_send() -> None:
+                nonlocal hedge_at
+                if index == started:
+                    hedge_at = loop.time() + self.hedge_delay
+                    sent.set()
+
+            success, translation = await self._atry_endpoint(text, endpoint, client, on_send)
+            if success and validate is not None:
+                error = validate(translation)
+                if error is not None:
+                    return endpoint[2], False, error
+            return endpoint[2], success, translation
+
+        remaining = list(self.api_endpoints if endpoints is None else endpoints)
+        pending = set()
+
+        def start_next() -> None:
+            nonlocal hedge_at, started
+            if not remaining:
+                return
+            endpoint = remaining.pop(0)
+            _, endpoint_type, endpoint_desc = endpoint
+            logger.info(f"Đang thử translate với: {endpoint_desc} ({endpoint_type})")
+            started += 1
+            hedge_at = None
+            sent.clear()
+            pending.add(asyncio.create_task(attempt(endpoint, started)))
+
+        start_next()
+        try:
+            while pending:
+                waiters = set(pending)
+                sent_waiter = None
+                timeout = None
+                if remaining:
+                    if hedge_at is None:
+                        # Chưa gửi request: chỉ bắt đầu đếm hedge_delay khi đã gửi
+                        sent_waiter = asyncio.create_task(sent.wait())
+                        waiters.add(sent_waiter)
+                    else:
+                        timeout = max(0.0, hedge_at - loop.time())
+
+                done, _ = await asyncio.wait(
+                    waiters,
+                    timeout=timeout,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if sent_waiter is not None:
+                    sent_waiter.cancel()
+                    done.discard(sent_waiter)
+                if not done:
+                    if sent_waiter is None:
+                        # Endpoint hiện tại chậm: khởi động thêm endpoint dự phòng
+                        start_next()
+                    continue
+
+                for task in done:
+                    pending.discard(task)
+                    endpoint_desc, success, translation = task.result()
+                    if success:
+                        return True, translation, endpoint_desc
+                    logger.warning(f"Thất bại với {endpoint_desc}: {translation}")
+                    start_next()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        return False, "Tất cả API endpoints đều thất bại", "failed"
+
+    async def _atranslate(
+        self,
+        text: str,
+        client: httpx.AsyncClient,
+        sem: Optional[asyncio.Semaphore] = None
+    ) -> Tuple[bool, str, str]:
+        """
+        Dịch một văn bản (async): hedged request tới các endpoint, sau đó
+        fallback googletrans.
+
+        Args:
+            text (str): Văn bản đã strip
+            client (httpx.AsyncClient): Client async dùng chung
+            sem (Optional[asyncio.Semaphore]): Giới hạn số request đồng thời
+
+        Returns:
+            Tuple[bool, str, str]: (success, translation/error_message, used_endpoint)
+        """
+        async with (sem or contextlib.nullcontext()):
+            success, translation, endpoint_desc = await self._arace(text, client)
+            if success:
+                logger.info(f"Dịch thành công: '{text}' -> '{translation}' ({endpoint_desc})")
+                return True, translation, endpoint_desc
+
+            # Fallback cuối cùng: thử googletrans
+            logger.info("Đang thử fallback với googletrans...")
+            success, translation = await self._atry_googletrans_fallback(text)
+            if success:
+                logger.info(f"Dịch thành công với fallback: '{text}' -> '{translation}'")
+                return True, translation, "googletrans-fallback"
+
+        error_msg = f"Không thể dịch '{text}' - tất cả API endpoints và fallback đều không khả dụng"
+        logger.error(error_msg)
+        return False, error_msg, "failed"
+
+    async def _atranslate_one(self, text: str) -> Tuple[bool, str, str]:
+        """Dịch một văn bản trên event loop nền (dùng cho translate_text)."""
+        return (await self._atranslate_all([text]))[0]
+
+    def _chunk_texts(self, texts: List[str]) -> List[List[str]]:
+        """
+        Chia danh sách văn bản thành các nhóm để gộp vào một request.
+
+        Mỗi nhóm khi nối bằng dấu phân cách không vượt quá max_joined_bytes
+        byte UTF-8 (một chữ Hán chiếm 3 byte; văn bản dài hơn giới hạn sẽ nằm
+        riêng một nhóm).
+
+        Args:
+            texts (List[str]): Danh sách văn bản
+
+        Returns:
+            List[List[str]]: Các nhóm văn bản theo thứ tự ban đầu
+        """
+        chunks: List[List[str]] = []
+        current: List[str] = []
+        current_len = 0
+        separator_len = len(_JOIN_SEPARATOR.encode('utf-8'))
+
+        for text in texts:
+            text_len = len(text.encode('utf-8'))
+            added_len = text_len + (separator_len if current else 0)
+            if current and current_len + added_len > self.max_joined_bytes:
+                chunks.append(current)
+                current, current_len = [], 0
+                added_len = text_len
+            current.append(text)
+            current_len += added_len
+
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def _atranslate_joined(
+        self,
+        texts: List[str],
+        client: httpx.AsyncClient,
+        sem: asyncio.Semaphore
+    ) -> List[Tuple[bool, str, str]]:
+        """
+        Dịch một nhóm văn bản bằng một request duy nhất.
+
+        Nối các văn bản bằng dấu phân cách, gửi tới các endpoint hỗ trợ văn
+        bản dài theo kiểu hedged request (như _arace) rồi tách kết quả. Kết
+        quả có số phần không khớp được coi như endpoint thất bại; nếu không
+        endpoint nào thành công trước hạn chót (hedge_delay × số endpoint gộp
+        + joined_rtt giây) thì quay về dịch
+        từng văn bản, các phần không được dịch sẽ được dịch lại riêng.
+
+        Args:
+            texts (List[str]): Nhóm văn bản đã strip
+            client (httpx.AsyncClient): Client async dùng chung
+            sem (asyncio.Semaphore): Giới hạn số request đồng thời
+
+        Returns:
+            List[Tuple[bool, str, str]]: Kết quả theo đúng thứ tự đầu vào
+        """
+        results: List[Optional[Tuple[bool, str, str]]] = [None] * len(texts)
+
+        if len(texts) > 1 and not any("===" in text for text in texts):
+            joined = _JOIN_SEPARATOR.join(texts)
+            joinable = [
+                endpoint for endpoint in self.api_endpoints
+                if endpoint[1] in _JOINABLE_ENDPOINT_TYPES
+            ]
+
+            def split_parts(translation: str) -> List[str]:
+                return [part.strip() for part in _JOIN_SPLIT_RE.split(translation.strip())]
+
+            def validate(translation: str) -> Optional[str]:
+                count = len(split_parts(translation))
+                if count != len(texts):
+                    return f"Kết quả dịch gộp không khớp: {count}/{len(texts)} phần"
+                return None
+
+            deadline = self.hedge_delay * len(joinable) + self.joined_rtt
+            async with sem:
+                try:
+                    success, translation, endpoint_desc = await asyncio.wait_for(
+                        self._arace(joined, client, endpoints=joinable, validate=validate),
+                        timeout=deadline
+                    )
+                except asyncio.TimeoutError:
+                    success, translation = False, f"quá {deadline}s"
+
+            if success:
+                # Phần nào rỗng hoặc trả về nguyên văn sẽ được dịch lại riêng
+                for i, (text, part) in enumerate(zip(texts, split_parts(translation))):
+                    if _is_new_translation(part, text):
+                        results[i] = (True, part, endpoint_desc)
+                logger.info(
+                    f"Dịch gộp thành công {sum(r is not None for r in results)}/{len(texts)} "
+                    f"văn bản ({endpoint_desc})"
+                )
+            else:
+                logger.warning(f"Dịch gộp thất bại, chuyển sang dịch từng văn bản: {translation}")
+
+        pending = [i for i, result in enumerate(results) if result is None]
+        if pending:
+            retried = await asyncio.gather(*[self._atranslate(texts[i], client, sem) for i in pending])
+            for i, result in zip(pending, retried):
+                results[i] = result
+
+        return results
+
+    def _segment_local(self, text: str) -> Optional[List[Tuple[str, Optional[str]]]]:
+        """
+        Tách văn bản theo từ điển offline (longest match từ trái sang phải).
+
+        Các ký tự không có trong từ điển liền nhau được gộp thành một đoạn
+        OOV (nghĩa None) để dịch qua API; đoạn không chứa chữ Hán được giữ
+        nguyên văn.
+
+        Args:
+            text (str): Văn bản đã strip
+
+        Returns:
+            Optional[List[Tuple[str, Optional[str]]]]: Danh sách (đoạn, nghĩa),
+                hoặc None nếu không khớp từ nào trong từ điển
+        """
+        if not self.local_dict:
+            return None
+
+        local_dict = self.local_dict
+        segments: List[Tuple[str, Optional[str]]] = []
+        matched = False
+        oov_start = 0
+        i, n = 0, len(text)
+
+        while i < n:
+            meaning = None
+            for length in range(min(self._local_dict_max_len, n - i), 0, -1):
+                meaning = local_dict.get(text[i:i + length])
+                if meaning is not None:
+                    break
+
+            if meaning is None:
+                i += 1
+                continue
+
+            oov = text[oov_start:i].strip()
+            if oov:
+                segments.append((oov, None if HAN_RE.search(oov) else oov))
+            segments.append((text[i:i + length], meaning))
+            matched = True
+            i += length
+            oov_start = i
+
+        if not matched:
+            return None
+
+        oov = text[oov_start:].strip()
+        if oov:
+            segments.append((oov, None if HAN_RE.search(oov) else oov))
+        return segments
+
+    def _assemble_segments(
+        self,
+        segments: List[Tuple[str, Optional[str]]],
+        translated: Dict[str, Tuple[bool, str, str]]
+    ) -> Tuple[bool, str, str]:
+        """
+        Ghép nghĩa các đoạn (từ điển offline + bản dịch API) theo thứ tự gốc.
+
+        Args:
+            segments (List[Tuple[str, Optional[str]]]): Kết quả _segment_local
+            translated (Dict[str, Tuple[bool, str, str]]): Kết quả dịch các đoạn OOV
+
+        Returns:
+            Tuple[bool, str, str]: (success, translation/error_message, used_endpoint)
+        """
+        parts = []
+        endpoints = ["local"]
+
+        for segment, meaning in segments:
+            if meaning is None:
+                success, meaning, endpoint = translated[segment]
+                if not success:
+                    return False, meaning, endpoint
+                endpoints.append(endpoint)
+            parts.append(meaning)
+
+        return True, " ".join(parts), "+".join(dict.fromkeys(endpoints))
+
+    async def _atranslate_all(self, texts: List[str]) -> List[Tuple[bool, str, str]]:
+        """
+        Dịch nhiều văn bản: gộp thành các nhóm và gửi đồng thời.
+
+        Văn bản khớp một phần từ điển offline chỉ gửi các đoạn OOV lên API.
+
+        Args:
+            texts (List[str]): Danh sách văn bản đã strip, chưa có trong cache
+
+        Returns:
+            List[Tuple[bool, str, str]]: Kết quả theo đúng thứ tự đầu vào
+        """
+        plans = [self._segment_local(text) for text in texts]
+
+        # Văn bản cần dịch qua API (không trùng lặp, giữ thứ tự)
+        pending: Dict[str, None] = {}
+        for text, segments in zip(texts, plans):
+            if segments is None:
+                pending[text] = None
+            else:
+                pending.update((segment, None) for segment, meaning in segments if meaning is None)
+
+        translated: Dict[str, Tuple[bool, str, str]] = {}
+        if pending:
+            to_translate = list(pending)
+            client = self._get_async_client()
+            sem = asyncio.Semaphore(self.max_concurrency)
+            chunk_results = await asyncio.gather(
+                *[self._atranslate_joined(chunk, client, sem) for chunk in self._chunk_texts(to_translate)]
+            )
+            translated = dict(zip(to_translate, [result for chunk in chunk_results for result in chunk]))
+
+        return [
+            translated[text] if segments is None else self._assemble_segments(segments, translated)
+            for text, segments in zip(texts, plans)
+        ]
+
+    async def _atry_googletrans_fallback(self, text: str) -> Tuple[bool, str]:
+        """
+        Phiên bản async của fallback googletrans (googletrans>=4.0 là async).
+
+        Args:
+            text (str): Text cần dịch
+
         Returns:
             Tuple[bool, str]: (success, translation_or_error)
         """
         try:
             from googletrans import Translator
             
-            translator = Translator()
-            result = translator.translate(text, src=self.source_lang, dest=self.target_lang)
+            async with Translator() as translator:
+                result = await translator.translate(text, src=self.source_lang, dest=self.target_lang)
             
-            if result and result.text and result.text.strip():
+            if result and result.text:
                 translation = result.text.strip()
                 # Kiểm tra không phải là text gốc
-                if translation.lower() != text.lower():
+                if _is_new_translation(translation, text):
                     return True, translation
                     
             return False, "No translation returned"
@@ -297,57 +1205,20 @@ class TranslationAPIHandler:
         text = chinese_text.strip()
         cache_key = self._get_cache_key(text)
 
-        # Kiểm tra cache trước
-        if cache_key in self.cache:
-            logger.info(f"Cache hit cho: '{text}'")
-            return True, self.cache[cache_key], "cache"
-
-        # Apply rate limiting
-        self._rate_limit()
-
-        # Thử từng endpoint
-        for endpoint_config in self.api_endpoints:
-            try:
-                endpoint_url = endpoint_config["url"]
-                endpoint_type = endpoint_config["type"]
-                endpoint_desc = endpoint_config["description"]
-                
-                logger.info(f"Đang thử translate với: {endpoint_desc} ({endpoint_type})")
-                
-                success, translation = self._try_endpoint(text, endpoint_config)
-                
-                if success:
-                    # Lưu vào cache
-                    self.cache[cache_key] = translation
-                    self._save_cache()
-                    
-                    logger.info(f"Dịch thành công: '{text}' -> '{translation}'")
-                    return True, translation, endpoint_desc
-                else:
-                    logger.warning(f"Thất bại với {endpoint_desc}: {translation}")
-                    continue
-
-            except Exception as e:
-                logger.error(f"Unexpected error với {endpoint_config['description']}: {e}")
-                continue
+        # Kiểm tra cache và từ điển offline trước
+        offline = self._lookup_offline(text)
+        if offline is not None:
+            translation, source = offline
+            logger.info(f"Tra cứu offline ({source}) cho: '{text}'")
+            return True, translation, source
 
-        # Fallback cuối cùng: thử googletrans
-        try:
-            logger.info("Đang thử fallback với googletrans...")
-            success, translation = self._try_googletrans_fallback(text)
-            if success:
-                # Lưu vào cache
-                self.cache[cache_key] = translation
-                self._save_cache()
-                logger.info(f"Dịch thành công với fallback: '{text}' -> '{translation}'")
-                return True, translation, "googletrans-fallback"
-        except Exception as e:
-            logger.error(f"Googletrans fallback failed: {e}")
+        success, translation, endpoint = self._run_async(self._atranslate_one(text))
+        if success:
+            # Lưu vào cache
+            self._cache_put(cache_key, translation)
+            self.compact_cache()
 
-        # Nếu tất cả endpoints đều fail
-        error_msg = f"Không thể dịch '{text}' - tất cả API endpoints và fallback đều không khả dụng"
-        logger.error(error_msg)
-        return False, error_msg, "failed"
+        return success, translation, endpoint
 
     def translate_batch(self, text_list: List[str]) -> List[Dict[str, Any]]:
         """
@@ -366,13 +1237,34 @@ class TranslationAPIHandler:
             ...     if result["success"]:
             ...         print(f"{result['original']} -> {result['translation']}")
         """
+        # Chuẩn hóa một lần, bỏ trùng lặp và tách phần tra được offline
+        norm = [text.strip() for text in text_list]
+        known: Dict[str, Tuple[bool, str, str]] = {}
+        unique: List[str] = []
+        for text in dict.fromkeys(t for t in norm if t):
+            offline = self._lookup_offline(text)
+            if offline is None:
+                unique.append(text)
+            else:
+                known[text] = (True, *offline)
+
+        if unique:
+            logger.info(f"Dịch đồng thời {len(unique)} văn bản chưa có trong cache/từ điển offline")
+            translated = self._run_async(self._atranslate_all(unique))
+
+            for text, (success, translation, endpoint) in zip(unique, translated):
+                known[text] = (success, translation, endpoint)
+                if success:
+                    self._cache_put(self._get_cache_key(text), translation)
+            self.compact_cache()
+
         results = []
         
-        for i, text in enumerate(text_list):
-            if not text.strip():
+        for i, text in enumerate(norm):
+            if not text:
                 results.append({
                     "index": i,
-                    "original": text,
+                    "original": text_list[i],
                     "success": False,
                     "translation": "",
                     "error": "Văn bản trống",
@@ -380,20 +1272,16 @@ class TranslationAPIHandler:
                 })
                 continue
             
-            success, result, endpoint = self.translate_text(text)
+            success, result, endpoint = known[text]
             
             results.append({
                 "index": i,
-                "original": text.strip(),
+                "original": text,
                 "success": success,
                 "translation": result if success else "",
                 "error": result if not success else "",
                 "endpoint": endpoint
             })
-            
-            # Thêm delay nhỏ giữa các requests để tránh rate limit
-            if i < len(text_list) - 1:
-                time.sleep(0.1)
         
         logger.info(f"Hoàn thành batch translation: {sum(1 for r in results if r['success'])}/{len(results)} thành công")
         return results
@@ -405,10 +1293,8 @@ class TranslationAPIHandler:
         Returns:
             List[Dict[str, str]]: Danh sách languages
         """
-        for endpoint_config in self.api_endpoints:
+        for endpoint_url, endpoint_type, endpoint_desc in self.api_endpoints:
             try:
-                endpoint_url = endpoint_config["url"]
-                endpoint_type = endpoint_config["type"]
                 
                 if endpoint_type == "libretranslate":
                     # Thay /translate bằng /languages cho LibreTranslate
@@ -417,12 +1303,12 @@ class TranslationAPIHandler:
                     response = self.session.get(lang_endpoint, timeout=self.timeout)
                     
                     if response.status_code == 200:
-                        languages = response.json()
-                        logger.info(f"Lấy được {len(languages)} ngôn ngữ từ {endpoint_config['description']}")
+                        languages = _json_loads(response.content)
+                        logger.info(f"Lấy được {len(languages)} ngôn ngữ từ {endpoint_desc}")
                         return languages
                         
             except Exception as e:
-                logger.error(f"Không thể lấy languages từ {endpoint_config['description']}: {e}")
+                logger.error(f"Không thể lấy languages từ {endpoint_desc}: {e}")
                 continue
         
         # Fallback - return basic info
@@ -438,14 +1324,23 @@ class TranslationAPIHandler:
         Returns:
             int: Số lượng entries đã xóa
         """
-        cache_size = len(self.cache)
-        self.cache.clear()
-        
-        try:
-            if os.path.exists(self.cache_file):
-                os.remove(self.cache_file)
-        except Exception as e:
-            logger.error(f"Không thể xóa cache file: {e}")
+        with self._cache_lock:
+            cache_size = len(self.cache) + len(self._legacy_cache)
+            self.cache.clear()
+            self._legacy_cache.clear()
+            # Các entry đang chờ ghi phải xong trước khi xóa file
+            self._write_q.join()
+
+            with self._file_lock:
+                self._close_cache_file()
+                self._cache_lines = 0
+
+                try:
+                    for cache_file in (self.cache_file, self.legacy_cache_file):
+                        if os.path.exists(cache_file):
+                            os.remove(cache_file)
+                except Exception as e:
+                    logger.error(f"Không thể xóa cache file: {e}")
         
         logger.info(f"Đã xóa {cache_size} cached translations")
         return cache_size
@@ -462,16 +1357,14 @@ class TranslationAPIHandler:
             cache_size_bytes = os.path.getsize(self.cache_file)
         
         return {
-            "total_entries": len(self.cache),
+            "total_entries": len(self.cache) + len(self._legacy_cache),
             "cache_file_size_bytes": cache_size_bytes,
             "cache_file_exists": os.path.exists(self.cache_file)
         }
 
 
-# Singleton instance
-_handler_instance: Optional[TranslationAPIHandler] = None
-
-
+# Singleton instance (functools.cache giữ instance đầu tiên)
+@cache
 def get_translation_handler() -> TranslationAPIHandler:
     """
     Lấy singleton instance của TranslationAPIHandler.
@@ -479,10 +1372,7 @@ def get_translation_handler() -> TranslationAPIHandler:
     Returns:
         TranslationAPIHandler: Instance duy nhất
     """
-    global _handler_instance
-    if _handler_instance is None:
-        _handler_instance = TranslationAPIHandler()
-    return _handler_instance
+    return TranslationAPIHandler()
 
 
 # Convenience functions
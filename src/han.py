@@ -0,0 +1,41 @@
+"""
+Module nhận diện chữ Hán
+========================
+
+Định nghĩa duy nhất các khối Unicode được coi là chữ Hán, dùng chung cho
+pinyin_converter và api_handler. Không phụ thuộc thư viện ngoài nên import
+nhanh (api_handler không phải nạp pypinyin chỉ để kiểm tra chữ Hán).
+"""
+
+import re
+
+# Khối CJK Unified Ideographs (U+4E00 - U+9FFF)
+CJK_START = 0x4E00
+CJK_END = 0xA000
+# Khối CJK Extension A (U+3400 - U+4DBF)
+CJK_EXT_A_START = 0x3400
+CJK_EXT_A_END = 0x4DC0
+
+# Các khối được coi là chữ Hán, dạng [start, end)
+HAN_RANGES = ((CJK_START, CJK_END), (CJK_EXT_A_START, CJK_EXT_A_END))
+# Tìm chữ Hán trong văn bản: văn bản không khớp được trả về nguyên văn, không gọi API
+HAN_RE = re.compile("[" + "".join(f"{chr(start)}-{chr(end - 1)}" for start, end in HAN_RANGES) + "]")
+
+# Ký tự đầu/cuối của từng khối, để so sánh chuỗi trực tiếp trong is_chinese_char
+(_CJK_FIRST, _CJK_LAST), (_CJK_EXT_A_FIRST, _CJK_EXT_A_LAST) = (
+    (chr(start), chr(end - 1)) for start, end in HAN_RANGES
+)
+
+
+def is_chinese_char(character: str) -> bool:
+    """
+    Kiểm tra một ký tự có phải chữ Hán (CJK Unified Ideographs hoặc Extension A).
+
+    Args:
+        character (str): Một ký tự
+
+    Returns:
+        bool: True nếu là chữ Hán
+    """
+    # So sánh chuỗi trực tiếp, khối chính (phổ biến nhất) được kiểm tra trước
+    return _CJK_FIRST <= character <= _CJK_LAST or _CJK_EXT_A_FIRST <= character <= _CJK_EXT_A_LAST
@@ -9,27 +9,190 @@ Tính năng:
 - Hỗ trợ chữ Hán đơn lẻ và từ ghép
 - Phiên âm Pinyin với dấu thanh đầy đủ
 - Xử lý lỗi và fallback cho ký tự không nhận dạng được
+- Bảng tra Pinyin tính sẵn cho chữ Hán đơn (không qua pypinyin mỗi lần gọi)
 """
 
 import logging
-from typing import List, Optional, Dict, Any
+import sys
+from functools import cache, lru_cache
+from typing import List, Optional, Dict, Any, Tuple
 from pypinyin import lazy_pinyin, Style
+from pypinyin.contrib.tone_convert import to_normal, to_tone, to_tone3
+from pypinyin.pinyin_dict import pinyin_dict
 import pypinyin
 
+try:
+    from .han import CJK_START, CJK_END, is_chinese_char
+except ImportError:  # Import trực tiếp qua sys.path (không qua package src)
+    from han import CJK_START, CJK_END, is_chinese_char
+
 # Cấu hình logging
 logger = logging.getLogger(__name__)
 
 
+def _build_pinyin_table() -> Dict[str, Tuple[str, str, int]]:
+    """
+    Tạo bảng tra Pinyin cho từng chữ Hán trong khối CJK Unified Ideographs.
+
+    Dùng âm đọc đầu tiên trong pinyin_dict của pypinyin, giống kết quả của
+    lazy_pinyin với một chữ đơn (heteronym=False). Chỉ áp dụng cho chữ đơn:
+    từ ghép có thể đọc khác theo ngữ cảnh (ví dụ 银行 - yín háng).
+
+    Returns:
+        Dict[str, Tuple[str, str, int]]: {chữ Hán: (pinyin có dấu, pinyin không dấu, số thanh)}
+    """
+    table: Dict[str, Tuple[str, str, int]] = {}
+    # Chỉ có khoảng 1400 âm tiết khác nhau: chuyển đổi mỗi âm tiết một lần
+    syllables: Dict[str, Tuple[str, str, int]] = {}
+
+    for cp in range(CJK_START, CJK_END):
+        readings = pinyin_dict.get(cp)
+        if readings is None:
+            continue
+        tone = readings.split(',', 1)[0]
+        entry = syllables.get(tone)
+        if entry is None:
+            tone3 = to_tone3(tone)
+            tone_number = int(tone3[-1]) if tone3[-1].isdigit() else 5
+            entry = syllables[tone] = (tone, to_normal(tone), tone_number)
+        table[chr(cp)] = entry
+
+    return table
+
+
+# Bảng tra tính sẵn khi import (khoảng 21000 chữ, vài chục ms)
+_PINYIN_TABLE = _build_pinyin_table()
+
+def lookup_character(character: str) -> Optional[Tuple[str, str, int]]:
+    """
+    Tra bảng Pinyin tính sẵn cho một chữ Hán (không gọi pypinyin).
+
+    Args:
+        character (str): Một ký tự
+
+    Returns:
+        Optional[Tuple[str, str, int]]: (pinyin có dấu, pinyin không dấu, số thanh),
+            hoặc None nếu ký tự không có trong bảng
+    """
+    return _PINYIN_TABLE.get(character)
+
+
+# Ký tự phân cách khi gộp nhiều từ vào một lần gọi lazy_pinyin (khoảng trắng
+# chữ Hán, pypinyin giữ nguyên như ký tự không phải chữ Hán)
+_BATCH_SEPARATOR = "\u3000"
+
+# Style pypinyin theo with_tone: _STYLES[False] = NORMAL, _STYLES[True] = TONE
+_STYLES = (Style.NORMAL, Style.TONE)
+
+# Số thanh theo ký tự cuối của âm tiết Style.TONE3 (không có số = thanh nhẹ, 5)
+_TONE_DIGITS = {"1": 1, "2": 2, "3": 3, "4": 4, "5": 5}
+
+# Số kết quả tối đa giữ trong LRU cache của các hàm chuyển đổi
+_CACHE_SIZE = 8192
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _convert_cached(text: str, with_tone: bool, separator: str, errors: str) -> str:
+    """
+    Chuyển đổi văn bản (đã strip) sang Pinyin, kết quả được cache LRU.
+
+    Exception không được cache, để lần gọi sau có thể thử lại.
+
+    Args:
+        text (str): Văn bản chữ Hán đã strip
+        with_tone (bool): Có bao gồm dấu thanh hay không
+        separator (str): Ký tự phân cách giữa các âm tiết
+        errors (str): Cách xử lý ký tự không phải chữ Hán của pypinyin
+
+    Returns:
+        str: Chuỗi Pinyin đã chuyển đổi
+    """
+    return separator.join(lazy_pinyin(text, style=_STYLES[with_tone], errors=errors))
+
+
+def _tone_numbers(text: str, errors: str) -> List[int]:
+    """
+    Lấy số thanh (1-5) của từng âm tiết trong văn bản (đã strip).
+
+    Args:
+        text (str): Văn bản chữ Hán đã strip
+        errors (str): Cách xử lý ký tự không phải chữ Hán của pypinyin
+
+    Returns:
+        List[int]: Danh sách số thanh (1-5, 5 = không dấu)
+    """
+    entry = _PINYIN_TABLE.get(text)
+    if entry is not None:
+        return [entry[2]]
+
+    # Sử dụng Style.TONE3 để lấy số thanh, trích xuất từ ký tự cuối âm tiết
+    pinyin_with_numbers = lazy_pinyin(text, style=Style.TONE3, errors=errors)
+    tone_digits = _TONE_DIGITS
+    return [tone_digits.get(syllable[-1:], 5) for syllable in pinyin_with_numbers]
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _analyze_cached(character: str, errors: str) -> Tuple[str, str, int]:
+    """
+    Lấy (pinyin có dấu, pinyin không dấu, số thanh) của một chữ Hán, có cache LRU.
+
+    Args:
+        character (str): Một chữ Hán
+        errors (str): Cách xử lý ký tự không phải chữ Hán của pypinyin
+
+    Returns:
+        Tuple[str, str, int]: (pinyin_tone, pinyin_no_tone, tone_number)
+    """
+    entry = _PINYIN_TABLE.get(character)
+    if entry is not None:
+        return entry
+
+    # Ký tự ngoài bảng: một lần gọi Style.TONE3, suy ra hai dạng còn lại
+    syllables = lazy_pinyin(character, style=Style.TONE3, errors=errors)
+    if not syllables:
+        return "", "", 5
+
+    syllable = syllables[0]
+    tone_number = _TONE_DIGITS.get(syllable[-1:])
+    if tone_number is not None:
+        return to_tone(syllable), syllable[:-1], tone_number
+    return syllable, syllable, 5  # Không dấu (neutral tone) hoặc không phải pinyin
+
+
+def get_pinyin_cache_stats() -> Dict[str, int]:
+    """
+    Lấy thống kê LRU cache của các hàm chuyển đổi Pinyin.
+
+    Returns:
+        Dict[str, int]: Số entries, số lần hit và miss
+    """
+    infos = (_convert_cached.cache_info(), _analyze_cached.cache_info())
+    return {
+        "total_entries": sum(info.currsize for info in infos),
+        "hits": sum(info.hits for info in infos),
+        "misses": sum(info.misses for info in infos)
+    }
+
+
+def clear_pinyin_cache() -> None:
+    """Xóa LRU cache của các hàm chuyển đổi Pinyin."""
+    _convert_cached.cache_clear()
+    _analyze_cached.cache_clear()
+
+
 class PinyinConverter:
     """
     Class chuyển đổi chữ Hán sang Pinyin với các tùy chọn linh hoạt.
     """
 
+    __slots__ = ("default_style", "errors", "_styles")
+
     def __init__(self):
         """Khởi tạo converter với cấu hình mặc định."""
         # Cấu hình pypinyin để sử dụng dấu thanh (tones)
         self.default_style = Style.TONE
         self.errors = "default"  # Xử lý lỗi: 'default', 'ignore', 'strict'
+        self._styles = _STYLES  # Chọn style bằng self._styles[with_tone]
 
     def convert_to_pinyin(
         self, 
@@ -59,21 +222,19 @@ class PinyinConverter:
             logger.warning("Input text trống hoặc chỉ chứa khoảng trắng")
             return ""
 
+        # Chữ Hán đơn: tra bảng tính sẵn. Không ghép Pinyin từng chữ cho từ
+        # ghép (kể cả bằng str.translate) vì âm đọc phụ thuộc ngữ cảnh
+        # (ví dụ 银行 - yín háng, không phải yín xíng)
+        entry = _PINYIN_TABLE.get(chinese_text.strip())
+        if entry is not None:
+            return entry[0] if with_tone else entry[1]
+
         try:
-            # Chọn style dựa trên tùy chọn dấu thanh
-            style = Style.TONE if with_tone else Style.NORMAL
-            
-            # Chuyển đổi sang Pinyin
-            pinyin_list = lazy_pinyin(
-                chinese_text.strip(),
-                style=style,
-                errors=self.errors
-            )
+            # Chuyển đổi sang Pinyin (kết quả lặp lại lấy từ LRU cache)
+            result = _convert_cached(chinese_text.strip(), with_tone, separator, self.errors)
             
-            # Kết hợp thành chuỗi với separator
-            result = separator.join(pinyin_list)
-            
-            logger.info(f"Chuyển đổi thành công: '{chinese_text}' -> '{result}'")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Chuyển đổi thành công: '{chinese_text}' -> '{result}'")
             return result
 
         except Exception as e:
@@ -103,23 +264,87 @@ class PinyinConverter:
                 {"original": "中国", "pinyin": "zhōng guó"}
             ]
         """
+        words = [word.strip() for word in word_list if word.strip()]
+
+        # Chữ Hán đơn tra bảng tính sẵn, chỉ các từ còn lại đi qua pypinyin
+        column = 0 if with_tone else 1
+        pinyins: List[Optional[str]] = []
+        pending: List[str] = []
+        for word in words:
+            entry = _PINYIN_TABLE.get(word)
+            if entry is None:
+                pending.append(word)
+                pinyins.append(None)
+            else:
+                pinyins.append(entry[column])
+
+        if pending:
+            converted = iter(self._convert_batch(pending, with_tone))
+            pinyins = [pinyin if pinyin is not None else next(converted) for pinyin in pinyins]
+
         results = []
         
-        for word in word_list:
-            if not word.strip():
-                continue
-                
-            pinyin_result = self.convert_to_pinyin(word.strip(), with_tone=with_tone)
-            
+        # Chỉ intern Pinyin (tập giá trị nhỏ, lặp lại nhiều); từ gốc thường là duy nhất,
+        # intern sẽ giữ chúng trong bộ nhớ suốt process
+        for word, pinyin_result in zip(words, pinyins):
             results.append({
-                "original": word.strip(),
-                "pinyin": pinyin_result,
+                "original": word,
+                "pinyin": sys.intern(pinyin_result),
                 "has_tone": with_tone
             })
         
-        logger.info(f"Chuyển đổi batch {len(results)} từ thành công")
+        logger.debug("Chuyển đổi batch %d từ thành công", len(results))
         return results
 
+    def _convert_batch(self, words: List[str], with_tone: bool) -> List[str]:
+        """
+        Chuyển đổi nhiều từ bằng một lần gọi lazy_pinyin.
+
+        Các từ được nối bằng _BATCH_SEPARATOR; pypinyin trả ký tự phân cách
+        (có thể dính với ký tự không phải chữ Hán liền kề) trong token, nên
+        tách lại theo ký tự này để khôi phục âm tiết của từng từ. Kết quả
+        giống hệt gọi convert_to_pinyin cho từng từ.
+
+        Args:
+            words (List[str]): Danh sách từ đã strip, không rỗng
+            with_tone (bool): Có bao gồm dấu thanh hay không
+
+        Returns:
+            List[str]: Pinyin của từng từ theo đúng thứ tự
+        """
+        # errors khác "default" có thể bỏ mất ký tự phân cách
+        if (len(words) < 2 or self.errors != "default"
+                or any(_BATCH_SEPARATOR in word for word in words)):
+            return [self.convert_to_pinyin(word, with_tone=with_tone) for word in words]
+
+        try:
+            tokens = lazy_pinyin(
+                _BATCH_SEPARATOR.join(words),
+                style=self._styles[with_tone],
+                errors=self.errors
+            )
+        except Exception as e:
+            logger.error(f"Lỗi khi chuyển đổi Pinyin batch, chuyển sang từng từ: {e}")
+            return [self.convert_to_pinyin(word, with_tone=with_tone) for word in words]
+
+        groups: List[List[str]] = [[]]
+        for token in tokens:
+            if _BATCH_SEPARATOR not in token:
+                groups[-1].append(token)
+                continue
+            pieces = token.split(_BATCH_SEPARATOR)
+            for i, piece in enumerate(pieces):
+                if i:
+                    groups.append([])
+                if piece:
+                    groups[-1].append(piece)
+
+        if len(groups) != len(words):
+            logger.warning("Kết quả Pinyin batch không khớp số từ, chuyển sang từng từ")
+            return [self.convert_to_pinyin(word, with_tone=with_tone) for word in words]
+
+        return [" ".join(group) for group in groups]
+
     def get_tone_numbers(self, chinese_text: str) -> List[int]:
         """
         Lấy thông tin về số thanh (1-5) của từng âm tiết.
@@ -139,22 +364,7 @@ class PinyinConverter:
             return []
 
         try:
-            # Sử dụng Style.TONE3 để lấy số thanh
-            pinyin_with_numbers = lazy_pinyin(
-                chinese_text.strip(),
-                style=Style.TONE3,
-                errors=self.errors
-            )
-            
-            tone_numbers = []
-            for syllable in pinyin_with_numbers:
-                # Trích xuất số thanh từ cuối âm tiết
-                if syllable[-1].isdigit():
-                    tone_numbers.append(int(syllable[-1]))
-                else:
-                    tone_numbers.append(5)  # Không dấu (neutral tone)
-            
-            return tone_numbers
+            return _tone_numbers(chinese_text.strip(), self.errors)
 
         except Exception as e:
             logger.error(f"Lỗi khi lấy tone numbers: {e}")
@@ -189,7 +399,7 @@ class PinyinConverter:
 
         try:
             # Kiểm tra có phải chữ Hán không
-            is_chinese = '\u4e00' <= character <= '\u9fff'
+            is_chinese = is_chinese_char(character)
             
             if not is_chinese:
                 return {
@@ -198,16 +408,14 @@ class PinyinConverter:
                     "error": "Không phải ký tự chữ Hán"
                 }
 
-            # Lấy thông tin Pinyin
-            pinyin_tone = self.convert_to_pinyin(character, with_tone=True)
-            pinyin_no_tone = self.convert_to_pinyin(character, with_tone=False)
-            tone_numbers = self.get_tone_numbers(character)
+            # Lấy thông tin Pinyin (kết quả lặp lại lấy từ LRU cache)
+            pinyin_tone, pinyin_no_tone, tone_number = _analyze_cached(character, self.errors)
             
             return {
                 "character": character,
                 "pinyin_tone": pinyin_tone,
                 "pinyin_no_tone": pinyin_no_tone,
-                "tone_number": tone_numbers[0] if tone_numbers else 5,
+                "tone_number": tone_number,
                 "is_chinese": True
             }
 
@@ -219,10 +427,8 @@ class PinyinConverter:
             }
 
 
-# Singleton instance để tái sử dụng
-_converter_instance: Optional[PinyinConverter] = None
-
-
+# Singleton instance để tái sử dụng (functools.cache giữ instance đầu tiên)
+@cache
 def get_converter() -> PinyinConverter:
     """
     Lấy singleton instance của PinyinConverter.
@@ -230,10 +436,7 @@ def get_converter() -> PinyinConverter:
     Returns:
         PinyinConverter: Instance duy nhất của converter
     """
-    global _converter_instance
-    if _converter_instance is None:
-        _converter_instance = PinyinConverter()
-    return _converter_instance
+    return PinyinConverter()
 
 
 # Convenience functions
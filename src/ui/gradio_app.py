@@ -10,31 +10,54 @@ Tạo giao diện web tương tác cho phép người dùng:
 """
 
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
 import gradio as gr
 import pandas as pd
 from typing import List, Tuple, Dict, Any, Optional
 import sys
 import os
 
-# Thêm src vào Python path để import modules
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+try:
+    # Import qua package (src.ui.gradio_app) để dùng chung singleton với main.py
+    from ..pinyin_converter import (
+        get_converter, PinyinConverter, clear_pinyin_cache, get_pinyin_cache_stats, lookup_character
+    )
+    from ..api_handler import get_translation_handler, TranslationAPIHandler
+except ImportError:
+    # Chạy trực tiếp file này: thêm src vào Python path để import modules
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from pinyin_converter import get_converter, PinyinConverter
-from api_handler import get_translation_handler, TranslationAPIHandler
+    from pinyin_converter import (
+        get_converter, PinyinConverter, clear_pinyin_cache, get_pinyin_cache_stats, lookup_character
+    )
+    from api_handler import get_translation_handler, TranslationAPIHandler
 
 # Cấu hình logging
 logger = logging.getLogger(__name__)
 
+# Tách dòng và bỏ khoảng trắng (kể cả dòng trống) hai bên mỗi dòng trong một lần quét
+_LINE_SPLIT_RE = re.compile(r"\s*\n\s*")
+
 
 class HanVietApp:
     """
     Class chính cho ứng dụng Gradio tra cứu từ Hán Việt.
     """
 
+    # Thread pool dùng chung giữa các instance (ví dụ khi Gradio reload tạo lại app)
+    _shared_pool: Optional[ThreadPoolExecutor] = None
+
     def __init__(self):
         """Khởi tạo app với các components cần thiết."""
         self.pinyin_converter = get_converter()
         self.translation_handler = get_translation_handler()
+        # Thread pool cho phần dịch (I/O mạng) chạy song song với phần Pinyin (CPU)
+        if HanVietApp._shared_pool is None:
+            HanVietApp._shared_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hanviet")
+        self._pool = HanVietApp._shared_pool
+        # Khởi động trước để request đầu tiên không phải chờ tạo event loop/client
+        self.translation_handler.warm_up()
         
         # Cấu hình UI
         self.title = "🔤 Từ điển Hán Việt - Pinyin & Dịch nghĩa"
@@ -73,26 +96,32 @@ class HanVietApp:
         chinese_text = chinese_input.strip()
         
         try:
+            # Dịch nghĩa trong thread pool, trong lúc đó chuyển đổi Pinyin và phân tích
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Đang xử lý: '{chinese_text}'")
+            translation_future = self._pool.submit(self.translation_handler.translate_text, chinese_text)
+
             # Chuyển đổi Pinyin
-            logger.info(f"Đang xử lý: '{chinese_text}'")
             pinyin_result = self.pinyin_converter.convert_to_pinyin(
                 chinese_text, 
                 with_tone=include_tone
             )
             
-            # Dịch nghĩa
-            success, translation, endpoint = self.translation_handler.translate_text(chinese_text)
-            
-            if not success:
-                translation = f"[Không thể dịch: {translation}]"
-                status = f"⚠️ Pinyin: OK, Dịch: Lỗi (endpoint: {endpoint})"
-            else:
-                status = f"✅ Thành công (dịch via: {endpoint})"
-            
             # Phân tích chi tiết (nếu được yêu cầu và là ký tự đơn)
             analysis = ""
             if show_analysis and len(chinese_text) == 1:
-                char_analysis = self.pinyin_converter.analyze_character(chinese_text)
+                # Chữ Hán có trong bảng tính sẵn: dùng trực tiếp, không cần phân tích lại
+                entry = lookup_character(chinese_text)
+                if entry is not None:
+                    pinyin_tone, pinyin_no_tone, tone_number = entry
+                    char_analysis = {
+                        "pinyin_tone": pinyin_tone,
+                        "pinyin_no_tone": pinyin_no_tone,
+                        "tone_number": tone_number,
+                        "is_chinese": True
+                    }
+                else:
+                    char_analysis = self.pinyin_converter.analyze_character(chinese_text)
                 if "error" not in char_analysis:
                     analysis = f"""
 **Phân tích chi tiết cho '{chinese_text}':**
@@ -102,6 +131,15 @@ class HanVietApp:
 - Là chữ Hán: {char_analysis.get('is_chinese', 'N/A')}
                     """.strip()
             
+            # Đợi kết quả dịch nghĩa
+            success, translation, endpoint = translation_future.result()
+            
+            if not success:
+                translation = f"[Không thể dịch: {translation}]"
+                status = f"⚠️ Pinyin: OK, Dịch: Lỗi (endpoint: {endpoint})"
+            else:
+                status = f"✅ Thành công (dịch via: {endpoint})"
+            
             return pinyin_result, translation, analysis, status
             
         except Exception as e:
@@ -127,42 +165,52 @@ class HanVietApp:
             return pd.DataFrame({"Thông báo": ["Vui lòng nhập danh sách từ cần tra cứu (mỗi từ một dòng)"]})
 
         # Tách từng dòng
-        lines = [line.strip() for line in batch_input.strip().split('\n') if line.strip()]
+        lines = [line for line in _LINE_SPLIT_RE.split(batch_input.strip()) if line]
         
         if not lines:
             return pd.DataFrame({"Thông báo": ["Không có từ hợp lệ để xử lý"]})
 
         logger.info(f"Xử lý batch {len(lines)} từ")
         
+        # Xử lý dịch trong thread pool, song song với xử lý Pinyin
+        translation_future = self._pool.submit(self.translation_handler.translate_batch, lines)
+        
         # Xử lý Pinyin
         pinyin_results = self.pinyin_converter.convert_word_list(lines, with_tone=include_tone)
         
-        # Xử lý dịch
-        translation_results = self.translation_handler.translate_batch(lines)
+        translation_results = translation_future.result()
+        # Tra kết quả dịch theo từ gốc (O(1) mỗi từ)
+        trans_by_word = {r["original"]: r for r in translation_results}
         
-        # Kết hợp kết quả
-        data = []
+        # Kết hợp kết quả theo từng cột
+        pinyins: List[str] = []
+        translations: List[str] = []
+        statuses: List[str] = []
+        success_count = 0
         for i, word in enumerate(lines):
-            pinyin = pinyin_results[i]["pinyin"] if i < len(pinyin_results) else "[Lỗi]"
+            pinyins.append(pinyin_results[i]["pinyin"] if i < len(pinyin_results) else "[Lỗi]")
             
-            translation_info = next((r for r in translation_results if r["original"] == word), None)
+            translation_info = trans_by_word.get(word)
             if translation_info and translation_info["success"]:
                 translation = translation_info["translation"]
-                status = f"✅ ({translation_info['endpoint']})"
+                status = sys.intern(f"✅ ({translation_info['endpoint']})")
+                success_count += 1
             else:
                 translation = f"[Lỗi: {translation_info['error'] if translation_info else 'Không tìm thấy'}]"
                 status = "❌ Lỗi"
             
-            data.append({
-                "STT": i + 1,
-                "Chữ Hán": word,
-                "Pinyin": pinyin,
-                "Nghĩa tiếng Việt": translation,
-                "Trạng thái": status
-            })
+            translations.append(translation)
+            statuses.append(status)
         
-        df = pd.DataFrame(data)
-        logger.info(f"Hoàn thành batch: {len([d for d in data if d['Trạng thái'].startswith('✅')])}/{len(data)} thành công")
+        df = pd.DataFrame({
+            "STT": range(1, len(lines) + 1),
+            "Chữ Hán": lines,
+            "Pinyin": pinyins,
+            "Nghĩa tiếng Việt": translations,
+            # Cột trạng thái chỉ có vài giá trị khác nhau
+            "Trạng thái": pd.Categorical(statuses)
+        })
+        logger.info(f"Hoàn thành batch: {success_count}/{len(lines)} thành công")
         
         return df
 
@@ -183,12 +231,14 @@ class HanVietApp:
 - File tồn tại: {'✅' if trans_stats['cache_file_exists'] else '❌'}
             """.strip()
             
-            # Pinyin info (không có cache riêng, nhưng có thể hiển thị stats khác)
+            # Pinyin info (cache LRU trong bộ nhớ)
+            pinyin_stats = get_pinyin_cache_stats()
             pinyin_info = f"""
 **Thông tin Pinyin converter:**
 - Sử dụng thư viện: pypinyin
 - Style mặc định: TONE (có dấu thanh)
 - Hỗ trợ: Chữ Hán simplified & traditional
+- Cache LRU: {pinyin_stats['total_entries']} entries ({pinyin_stats['hits']} hits / {pinyin_stats['misses']} misses)
             """.strip()
             
             return pinyin_info, trans_info
@@ -206,6 +256,7 @@ class HanVietApp:
         """
         try:
             cleared_count = self.translation_handler.clear_cache()
+            clear_pinyin_cache()
             return f"✅ Đã xóa {cleared_count} entries khỏi cache dịch thuật"
         except Exception as e:
             logger.error(f"Lỗi xóa cache: {e}")